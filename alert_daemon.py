@@ -0,0 +1,207 @@
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import requests
+
+import market_data
+from indicators import wilder_averages, update_wilder_averages, rsi_from_averages
+
+# Headless price / RSI alert worker. Run it next to (not inside) the Streamlit app:
+#
+#     python alert_daemon.py --config alert_watchlist.json
+#
+# History is downloaded once at startup to seed the RSI state; after that each cycle
+# only pulls today's bars for the whole watchlist in one request and advances the
+# state by the bars that are new since the last cycle.
+
+INTRADAY_INTERVALS = ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"]
+
+DEFAULT_CONFIG = {
+    "interval": "5m",
+    "poll_seconds": 60,
+    "rsi_window": 14,
+    "seed_period": "5d",
+    "queue": "alerts.jsonl",
+    "webhook_url": None,
+    "watchlist": [],
+    "rules": [
+        {"type": "rsi_cross", "level": 30, "direction": "below"},
+        {"type": "rsi_cross", "level": 70, "direction": "above"},
+    ],
+}
+
+
+def load_config(path):
+    with open(path) as f:
+        config = {**DEFAULT_CONFIG, **json.load(f)}
+    if config["interval"] not in INTRADAY_INTERVALS:
+        raise ValueError(f"interval must be one of {', '.join(INTRADAY_INTERVALS)}")
+    config["watchlist"] = list(dict.fromkeys(t.strip().upper() for t in config["watchlist"]))
+    if not config["watchlist"]:
+        raise ValueError("watchlist is empty")
+    for rule in config["rules"]:
+        if rule.get("type") not in ("rsi_cross", "price_cross"):
+            raise ValueError(f"Unknown rule type: {rule.get('type')}")
+        if rule.get("direction") not in ("above", "below"):
+            raise ValueError(f"Rule direction must be 'above' or 'below': {rule}")
+    return config
+
+
+class AlertState:
+    """Per-symbol close, Wilder averages and RSI, held as arrays aligned to the watchlist."""
+
+    def __init__(self, symbols, window):
+        self.symbols = pd.Index(symbols)
+        self.window = window
+        n = len(symbols)
+        self.last_time = pd.Series(pd.NaT, index=self.symbols, dtype="datetime64[ns, UTC]")
+        self.close = np.full(n, np.nan)
+        self.avg_gain = np.full(n, np.nan)
+        self.avg_loss = np.full(n, np.nan)
+        self.rsi = np.full(n, np.nan)
+        # Closes of symbols that don't have `window` bars yet, by position in `symbols`
+        self.pending = {}
+
+    def seed(self, closes):
+        # Full-history pass, only done once at startup. Columns are NaN during the other
+        # exchange's hours; wilder_averages skips those rows, matching advance()
+        closes = closes.reindex(columns=self.symbols)
+        avg_gain, avg_loss = wilder_averages(closes, self.window)
+        self.close = closes.ffill().iloc[-1].to_numpy()
+        self.avg_gain = avg_gain.ffill().iloc[-1].to_numpy()
+        self.avg_loss = avg_loss.ffill().iloc[-1].to_numpy()
+        self.rsi = rsi_from_averages(self.avg_gain, self.avg_loss)
+        self.last_time = closes.apply(pd.Series.last_valid_index).astype("datetime64[ns, UTC]")
+        self.pending = {i: closes.iloc[:, i].dropna().tolist() for i in np.flatnonzero(np.isnan(self.avg_gain))}
+
+    def advance(self, timestamp, closes):
+        """Apply one bar (array of closes, NaN = no bar for that symbol).
+
+        Returns the (close, rsi) arrays from before the update so rules can detect crossings.
+        """
+        fresh = ~np.isnan(closes) & ~(self.last_time >= timestamp).to_numpy()
+        prev_close, prev_rsi = self.close.copy(), self.rsi.copy()
+
+        delta = np.where(fresh, closes - self.close, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_gain, avg_loss = update_wilder_averages(self.avg_gain, self.avg_loss, delta, self.window)
+            rsi = rsi_from_averages(avg_gain, avg_loss)
+        self.avg_gain = np.where(fresh, avg_gain, self.avg_gain)
+        self.avg_loss = np.where(fresh, avg_loss, self.avg_loss)
+        self.close = np.where(fresh, closes, self.close)
+        self.rsi = np.where(fresh, rsi, self.rsi)
+        self.last_time[fresh] = timestamp
+
+        # Symbols short of a full window (new listing, failed download, short seed period)
+        # buffer their closes and are seeded as soon as the buffer is long enough
+        for i in np.flatnonzero(fresh & np.isnan(self.avg_gain)):
+            buffer = self.pending.setdefault(i, [])
+            buffer.append(closes[i])
+            avg_gain, avg_loss = wilder_averages(pd.Series(buffer), self.window)
+            if pd.notna(avg_gain.iloc[-1]):
+                self.avg_gain[i], self.avg_loss[i] = avg_gain.iloc[-1], avg_loss.iloc[-1]
+                self.rsi[i] = rsi_from_averages(self.avg_gain[i], self.avg_loss[i])
+                del self.pending[i]
+        return prev_close, prev_rsi, fresh
+
+
+def crossed(prev, curr, level, direction):
+    with np.errstate(invalid="ignore"):
+        if direction == "above":
+            return (prev <= level) & (curr > level)
+        return (prev >= level) & (curr < level)
+
+
+def evaluate_rules(rules, state, timestamp, prev_close, prev_rsi, fresh):
+    alerts = []
+    for rule in rules:
+        if rule["type"] == "rsi_cross":
+            prev, curr = prev_rsi, state.rsi
+        else:
+            prev, curr = prev_close, state.close
+        hit = crossed(prev, curr, rule["level"], rule["direction"]) & fresh
+        if "symbol" in rule:
+            hit &= state.symbols == rule["symbol"].upper()
+        for i in np.flatnonzero(hit):
+            alerts.append({
+                "symbol": state.symbols[i],
+                "rule": rule["type"],
+                "direction": rule["direction"],
+                "level": rule["level"],
+                "close": round(float(state.close[i]), 4),
+                "rsi": round(float(state.rsi[i]), 2),
+                "bar_time": timestamp.isoformat(),
+                "triggered_at": datetime.now(timezone.utc).isoformat(),
+            })
+    return alerts
+
+
+def publish(alerts, config):
+    # Append-only JSON lines queue; the optional webhook is a stand-in for a real notifier
+    if not alerts:
+        return
+    with open(config["queue"], "a") as f:
+        for alert in alerts:
+            f.write(json.dumps(alert) + "\n")
+    for alert in alerts:
+        print(f"ALERT {alert['symbol']}: {alert['rule']} {alert['direction']} {alert['level']} "
+              f"(close {alert['close']}, RSI {alert['rsi']})")
+    if config["webhook_url"]:
+        try:
+            requests.post(config["webhook_url"], json={"alerts": alerts}, timeout=10)
+        except Exception as e:
+            print(f"Error: webhook delivery failed: {e}")
+
+
+def completed_bars(closes, interval, now):
+    # Drop the bar that is still forming so a rule cannot fire on a partial candle
+    closes = closes.dropna(how="all")
+    if closes.index.tz is None:
+        closes.index = closes.index.tz_localize("UTC")
+    closes.index = closes.index.tz_convert("UTC")
+    return closes[closes.index + pd.Timedelta(interval) <= now]
+
+
+def run_cycle(state, config):
+    closes = market_data.fetch_price_table(tuple(state.symbols), "1d", config["interval"])
+    closes = completed_bars(closes, config["interval"], pd.Timestamp.now(tz="UTC"))
+    oldest = state.last_time.min()
+    if pd.notna(oldest):
+        closes = closes[closes.index > oldest]
+
+    alerts = []
+    for timestamp, row in closes.iterrows():
+        prev_close, prev_rsi, fresh = state.advance(timestamp, row.to_numpy(dtype=float))
+        alerts += evaluate_rules(config["rules"], state, timestamp, prev_close, prev_rsi, fresh)
+    publish(alerts, config)
+    return alerts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless price / RSI alert worker")
+    parser.add_argument("--config", default="alert_watchlist.json")
+    parser.add_argument("--once", action="store_true", help="Run a single cycle and exit")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    state = AlertState(config["watchlist"], config["rsi_window"])
+    history = market_data.fetch_price_table(tuple(state.symbols), config["seed_period"], config["interval"])
+    state.seed(completed_bars(history, config["interval"], pd.Timestamp.now(tz="UTC")))
+    print(f"Watching {len(state.symbols)} symbols on {config['interval']} bars")
+
+    while True:
+        try:
+            run_cycle(state, config)
+        except Exception as e:
+            print(f"Error: {e}")
+        if args.once:
+            break
+        time.sleep(config["poll_seconds"])
+
+
+if __name__ == "__main__":
+    main()
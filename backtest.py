@@ -0,0 +1,100 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from indicators import calculate_rsi
+
+TRADING_DAYS = 252
+
+# Below this many (window, lower, upper, ticker) runs a pool costs more than it saves
+POOL_THRESHOLD = 2000
+
+
+def rsi_positions(rsi, lower=30, upper=70):
+    """Long/flat positions for an RSI mean-reversion rule: buy below `lower`, sell above `upper`.
+
+    Works column-wise on a wide frame, so every ticker is handled in the same pass.
+    """
+    signal = pd.DataFrame(np.nan, index=rsi.index, columns=rsi.columns)
+    signal = signal.mask(rsi < lower, 1.0).mask(rsi > upper, 0.0)
+    return signal.ffill().fillna(0.0)
+
+
+def run_rsi_strategy(closes, window=14, lower=30, upper=70, cost=0.0, rsi=None):
+    """Backtest the RSI threshold rule on every column of `closes`.
+
+    Trades on the bar after the signal. `cost` is charged per unit of turnover.
+    `closes` may hold NaN where a ticker's exchange was closed: no signal is taken on
+    those rows and the move across the gap is booked on the next session.
+    Returns (equity curves, per-bar strategy returns, positions), all wide frames.
+    """
+    if lower >= upper:
+        raise ValueError(f"RSI buy level ({lower}) must be below the sell level ({upper})")
+    if rsi is None:
+        rsi = calculate_rsi({'Close': closes}, window)
+    rsi = rsi.where(closes.notna())
+    position = rsi_positions(rsi, lower, upper).shift(1).fillna(0.0)
+    returns = closes.ffill().pct_change(fill_method=None).fillna(0.0)
+    strategy_returns = position * returns - cost * position.diff().abs().fillna(0.0)
+    equity = (1 + strategy_returns).cumprod()
+    return equity, strategy_returns, position
+
+
+def summarize(equity, strategy_returns, position, periods_per_year=TRADING_DAYS):
+    years = len(equity) / periods_per_year
+    total_return = equity.iloc[-1] - 1
+    drawdown = equity / equity.cummax() - 1
+    std = strategy_returns.std()
+    return pd.DataFrame({
+        'total_return': total_return,
+        'cagr': equity.iloc[-1] ** (1 / years) - 1 if years else np.nan,
+        'sharpe': (strategy_returns.mean() / std.replace(0, np.nan)) * np.sqrt(periods_per_year),
+        'max_drawdown': drawdown.min(),
+        'exposure': position.mean(),
+    })
+
+
+def _sweep_window(closes, window, thresholds, cost, periods_per_year):
+    # RSI only depends on the window, so compute it once and reuse it for every threshold pair
+    rsi = calculate_rsi({'Close': closes}, window)
+    results = []
+    for lower, upper in thresholds:
+        equity, strategy_returns, position = run_rsi_strategy(closes, window, lower, upper, cost, rsi=rsi)
+        stats = summarize(equity, strategy_returns, position, periods_per_year)
+        stats.index.name = 'ticker'
+        stats = stats.reset_index()
+        stats.insert(0, 'upper', upper)
+        stats.insert(0, 'lower', lower)
+        stats.insert(0, 'window', window)
+        results.append(stats)
+    return pd.concat(results, ignore_index=True)
+
+
+def sweep(closes, windows, lowers, uppers, cost=0.0, periods_per_year=TRADING_DAYS, processes=None,
+          pool_threshold=POOL_THRESHOLD):
+    """Run every (window, lower, upper) combination on every ticker in `closes`.
+
+    Sweeps of at least `pool_threshold` runs are split by window across a process pool
+    using all CPU cores (or `processes` workers); smaller ones run in-process.
+    """
+    thresholds = [(lo, up) for lo, up in product(lowers, uppers) if lo < up]
+    windows = list(windows)
+    if not thresholds or not windows:
+        return pd.DataFrame()
+    runs = len(windows) * len(thresholds) * closes.shape[1]
+
+    if processes == 1 or runs < pool_threshold or len(windows) == 1:
+        parts = [_sweep_window(closes, w, thresholds, cost, periods_per_year) for w in windows]
+    else:
+        workers = min(processes or os.cpu_count() or 1, len(windows))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_sweep_window, closes, w, thresholds, cost, periods_per_year)
+                for w in windows
+            ]
+            parts = [f.result() for f in futures]
+
+    return pd.concat(parts, ignore_index=True)
@@ -1,5 +1,4 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -7,8 +6,21 @@ from datetime import datetime, timedelta
 import base64
 import streamlit.components.v1 as components
 import requests
-
-@st.cache_data(ttl=3600)
+import portfolio
+import market_data
+import market_calendar
+import backtest
+from indicators import calculate_rsi
+import shared_cache
+
+def cache_layer(ttl=None):
+    # Per-process st.cache_data by default; with STOCKINFO_SHARED_CACHE set, every server
+    # process reads and writes one shared SQLite cache instead of keeping its own copy
+    if shared_cache.enabled():
+        return shared_cache.cached(ttl=ttl)
+    return st.cache_data(ttl=ttl)
+
+@cache_layer(ttl=3600)
 def convert_usd_to_eur(amount):
     # Using the latest 2026 endpoint
     url = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json"
@@ -27,7 +39,7 @@ def convert_usd_to_eur(amount):
         print(f"Error: {e}")
         return amount * 0.92 # Fallback
 
-@st.cache_data(ttl=3600)
+@cache_layer(ttl=3600)
 def convert_eur_to_usd(amount):
     # Using the latest 2026 endpoint
     url = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/eur.json"
@@ -46,7 +58,7 @@ def convert_eur_to_usd(amount):
         print(f"Error: {e}")
         return amount * 1.08 # Fallback
 
-@st.cache_data
+@cache_layer()
 def get_base64_of_bin_file(bin_file):
     with open(bin_file, 'rb') as f:
         data = f.read()
@@ -228,28 +240,9 @@ st.markdown("""
 
 # --- APP LOGIC ---
 
-@st.cache_data(ttl=600)
-def fetch_stock_data(ticker, period):
-    stock = yf.Ticker(ticker)
-    # Get historical data
-    df = stock.history(period=period)
-    # Get info for ratios
-    info = stock.info
-    return df, info
-
-def calculate_rsi(data, window=14):
-    delta = data['Close'].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    
-    # Wilder's Smoothing: avg_gain = (prev_avg_gain * (n-1) + current_gain) / n
-    # This is equivalent to EMA with alpha = 1 / n
-    avg_gain = gain.ewm(alpha=1/window, min_periods=window, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1/window, min_periods=window, adjust=False).mean()
-    
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+fetch_stock_data = cache_layer(ttl=600)(market_data.fetch_stock_data)
+fetch_price_table = cache_layer(ttl=600)(market_data.fetch_price_table)
+fetch_fx_table = cache_layer(ttl=3600)(market_data.fetch_fx_table)
 
 # Sidebar - Stock Selection
 st.sidebar.header("Select Stock")
@@ -303,6 +296,11 @@ time_range_map = {
     "5 Years": "5y",
     "10 Years": "10y"
 }
+# Short views use intraday bars so the chart shows the trading session itself
+period_interval_map = {
+    "1d": "5m",
+    "5d": "30m"
+}
 time_range_options = list(time_range_map.keys())
 # Use session state to persist value when widget is moved/rerun
 if 'time_horizon' not in st.session_state:
@@ -314,6 +312,7 @@ if 'time_horizon_widget' in st.session_state and st.session_state.time_horizon_w
 
 selected_range_label = st.session_state.time_horizon
 selected_period = time_range_map[selected_range_label]
+selected_interval = period_interval_map.get(selected_period, "1d")
 
 
 # Music Control
@@ -343,7 +342,7 @@ header_placeholder.markdown("""
 
 try:
     with st.spinner(f'Fetching data for {selected_stock}...'):
-        df, info = fetch_stock_data(selected_stock, selected_period)
+        df, info = fetch_stock_data(selected_stock, selected_period, selected_interval)
         # Check if source currency is EUR (specific to these German stocks)
         eur_stocks = ['MBG.DE', 'VOW3.DE', 'BMW.DE']
         if selected_stock in eur_stocks:
@@ -383,9 +382,6 @@ try:
         else:
             display_price = current_price
 
-        # Ensure only Monday to Friday (dayofweek < 5: 0=Mon, 4=Fri)
-        display_df = display_df[display_df.index.dayofweek < 5]
-
         price_change = current_price - prev_price
         pct_change = (price_change / prev_price) * 100
 
@@ -484,9 +480,11 @@ try:
                 title="RSI (14)",
                 fixedrange=True
             ),
-            xaxis_rangebreaks=[
-                dict(bounds=["sat", "mon"]), # hide weekends
-            ],
+            # hide weekends, exchange holidays and (intraday) overnight hours
+            xaxis_rangebreaks=market_calendar.rangebreaks(
+                market_calendar.exchange_for_ticker(selected_stock),
+                display_df.index
+            ),
             margin=dict(l=0, r=0, t=20, b=0),
             height=650, # Increased height to accommodate the extra chart
             xaxis_rangeslider_visible=False,
@@ -614,6 +612,122 @@ try:
 except Exception as e:
     st.error(f"Error loading dashboard: {str(e)}")
 
+# --- PORTFOLIO SECTION ---
+st.sidebar.header("Portfolio")
+portfolio_file = st.sidebar.file_uploader(
+    "Import holdings (CSV: ticker, quantity, cost_basis per share[, currency])",
+    type="csv",
+    key="portfolio_file"
+)
+
+if portfolio_file is not None:
+    st.markdown("### 💼 Portfolio")
+    try:
+        lots = portfolio.load_positions_csv(portfolio_file)
+        base_currency = st.session_state.currency
+        base_symbol = "€" if base_currency == "EUR" else "$"
+        # A 1 day view still needs the previous close for daily P&L
+        history_period = "5d" if selected_period == "1d" else selected_period
+        # Fill exchange holidays with the last close before slicing, so the previous
+        # close is still there on the first session after a holiday
+        closes = fetch_price_table(tuple(sorted(lots['ticker'].unique())), history_period).ffill()
+        if selected_period == "1d":
+            closes = closes.iloc[-2:]
+        fx = fetch_fx_table(base_currency)
+        lot_values, holdings = portfolio.value_portfolio(lots, closes, fx)
+
+        p_col1, p_col2, p_col3 = st.columns(3)
+        p_col1.metric("Market Value", f"{base_symbol}{holdings['market_value'].sum():,.2f}")
+        p_col2.metric("Daily P&L", f"{base_symbol}{holdings['daily_pnl'].sum():,.2f}")
+        p_col3.metric(f"P&L ({selected_range_label})", f"{base_symbol}{holdings['period_pnl'].sum():,.2f}")
+
+        holdings_view = holdings.reset_index().rename(columns={
+            'ticker': 'Ticker',
+            'quantity': 'Quantity',
+            'market_value': f'Value ({base_currency})',
+            'cost': f'Cost ({base_currency})',
+            'unrealized_pnl': 'Unrealized P&L',
+            'daily_pnl': 'Daily P&L',
+            'period_pnl': f'P&L ({selected_range_label})',
+            'allocation': 'Allocation'
+        })
+        holdings_view['Allocation'] = holdings_view['Allocation'] * 100
+        st.dataframe(
+            holdings_view,
+            width='stretch',
+            hide_index=True,
+            column_config={"Allocation": st.column_config.NumberColumn(format="%.2f%%")}
+        )
+
+        incomplete = lot_values[['market_value', 'daily_pnl', 'period_pnl']].isna().any(axis=1)
+        missing = lot_values.loc[incomplete, 'ticker'].unique()
+        if len(missing):
+            st.warning(f"No price, currency or FX rate found for: {', '.join(missing)}. "
+                       "Add a currency column to the CSV for listings outside the US and Europe.")
+    except Exception as e:
+        st.error(f"Error loading portfolio: {str(e)}")
+
+# --- RSI BACKTEST SECTION ---
+with st.expander("🧪 RSI Backtest"):
+    bt_options = list(dict.fromkeys(default_stocks + [selected_stock]))
+    bt_tickers = st.multiselect("Tickers", bt_options, default=[selected_stock], key="bt_tickers")
+    bt_col1, bt_col2, bt_col3, bt_col4 = st.columns(4)
+    bt_period = bt_col1.selectbox("History", ["1y", "5y", "10y"], index=1, key="bt_period")
+    bt_window = bt_col2.number_input("RSI window", min_value=2, max_value=50, value=14, key="bt_window")
+    bt_lower = bt_col3.number_input("Buy below", min_value=1, max_value=99, value=30, key="bt_lower")
+    bt_upper = bt_col4.number_input("Sell above", min_value=1, max_value=99, value=70, key="bt_upper")
+
+    if bt_lower >= bt_upper:
+        st.warning("'Buy below' must be lower than 'Sell above'.")
+    elif bt_tickers:
+        try:
+            bt_closes = fetch_price_table(tuple(bt_tickers), bt_period).dropna(how='all')
+            equity, strategy_returns, position = backtest.run_rsi_strategy(bt_closes, bt_window, bt_lower, bt_upper)
+            buy_hold = bt_closes.ffill() / bt_closes.bfill().iloc[0]
+
+            eq_fig = go.Figure()
+            for ticker in equity.columns:
+                eq_fig.add_trace(go.Scatter(x=equity.index, y=equity[ticker], name=f"{ticker} RSI", mode='lines'))
+                eq_fig.add_trace(go.Scatter(
+                    x=buy_hold.index, y=buy_hold[ticker], name=f"{ticker} Buy & Hold",
+                    mode='lines', line=dict(dash='dot', width=1)
+                ))
+            eq_fig.update_layout(
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                xaxis=dict(showgrid=False, tickfont=dict(color='rgba(255,255,255,0.5)')),
+                yaxis=dict(
+                    showgrid=True,
+                    gridcolor='rgba(255,255,255,0.05)',
+                    tickfont=dict(color='rgba(255,255,255,0.5)'),
+                    side='right',
+                    title="Growth of 1"
+                ),
+                margin=dict(l=0, r=0, t=20, b=0),
+                height=400,
+                hovermode="x unified"
+            )
+            st.plotly_chart(eq_fig, width='stretch')
+
+            stats = backtest.summarize(equity, strategy_returns, position)
+            st.dataframe(stats, width='stretch')
+
+            if st.button("Run parameter sweep", key="bt_sweep"):
+                with st.spinner("Sweeping RSI windows and thresholds..."):
+                    sweep_results = backtest.sweep(
+                        bt_closes,
+                        windows=range(5, 31),
+                        lowers=range(15, 45, 5),
+                        uppers=range(55, 90, 5)
+                    )
+                st.dataframe(
+                    sweep_results.sort_values('sharpe', ascending=False).head(25),
+                    width='stretch',
+                    hide_index=True
+                )
+        except Exception as e:
+            st.error(f"Error running backtest: {str(e)}")
+
 st.markdown("""
     <div class="footer">
         • Created by Vincent
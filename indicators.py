@@ -0,0 +1,35 @@
+def wilder_averages(close, window=14):
+    # Each bar is compared with the symbol's previous *valid* close, and missing bars stay NaN
+    # and are skipped by the smoothing (ignore_na), so a wide frame mixing exchanges gives the
+    # same result per column as running that column on its own dropna() series
+    delta = close - close.ffill().shift(1)
+    first_bar = close.notna() & close.ffill().shift(1).isna()
+    delta = delta.mask(first_bar, 0)
+    gain = delta.clip(lower=0)
+    loss = (-delta).clip(lower=0)
+    
+    # Wilder's Smoothing: avg_gain = (prev_avg_gain * (n-1) + current_gain) / n
+    # This is equivalent to EMA with alpha = 1 / n
+    avg_gain = gain.ewm(alpha=1/window, min_periods=window, adjust=False, ignore_na=True).mean()
+    avg_loss = loss.ewm(alpha=1/window, min_periods=window, adjust=False, ignore_na=True).mean()
+    return avg_gain, avg_loss
+
+
+def update_wilder_averages(avg_gain, avg_loss, delta, window=14):
+    # One smoothing step for a new bar; works element-wise on arrays of symbols
+    gain = delta.clip(min=0)
+    loss = (-delta).clip(min=0)
+    avg_gain = (avg_gain * (window - 1) + gain) / window
+    avg_loss = (avg_loss * (window - 1) + loss) / window
+    return avg_gain, avg_loss
+
+
+def rsi_from_averages(avg_gain, avg_loss):
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def calculate_rsi(data, window=14):
+    # Works on a single 'Close' series or a wide frame of closes (one column per ticker)
+    avg_gain, avg_loss = wilder_averages(data['Close'], window)
+    return rsi_from_averages(avg_gain, avg_loss)
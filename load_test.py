@@ -0,0 +1,107 @@
+import argparse
+import functools
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+import shared_cache
+
+# Load test for the multi-process deployment mode. Each worker process stands in for one
+# Streamlit server and drives several simulated sessions through the dashboard with
+# streamlit's AppTest. Compare upstream traffic with and without the shared cache:
+#
+#     python load_test.py --workers 4 --sessions 10
+#     python load_test.py --workers 4 --sessions 10 --no-shared
+
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard.py")
+
+TICKERS = ['GOOG', 'NVDA', 'TSLA', 'MSFT', 'MBG.DE', 'BMW.DE']
+TIME_RANGES = ["1 Day", "5 Days", "1 Month", "1 Year"]
+
+
+def count_calls(counter, name, func):
+    # wraps() keeps the original name, which both cache layers use to key entries
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        counter[name] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def run_worker(job):
+    worker_id, sessions, cache_file, seed = job
+    if cache_file:
+        os.environ["STOCKINFO_SHARED_CACHE"] = cache_file
+    else:
+        os.environ.pop("STOCKINFO_SHARED_CACHE", None)
+
+    import requests
+    import market_data
+    from streamlit.testing.v1 import AppTest
+
+    # Count calls that leave the process. yfinance goes through curl_cffi, so its traffic is
+    # counted at the market_data fetchers; requests.get only sees the FX API
+    upstream = Counter()
+    requests.get = count_calls(upstream, "FX API (requests.get)", requests.get)
+    for name in ["fetch_stock_data", "fetch_price_table", "fetch_fx_table"]:
+        setattr(market_data, name, count_calls(upstream, name, getattr(market_data, name)))
+
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+    for _ in range(sessions):
+        at = AppTest.from_file(DASHBOARD, default_timeout=120)
+        at.session_state["selected_stock"] = rng.choice(TICKERS)
+        at.session_state["time_horizon"] = rng.choice(TIME_RANGES)
+        start = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - start)
+        if at.exception or at.error:
+            errors += 1
+    return worker_id, latencies, errors, dict(upstream)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive simulated dashboard sessions from several processes")
+    parser.add_argument("--workers", type=int, default=4, help="Simulated server processes")
+    parser.add_argument("--sessions", type=int, default=10, help="Sessions per worker")
+    parser.add_argument("--cache", default=None, help="Shared cache file (default: a fresh temp file)")
+    parser.add_argument("--no-shared", action="store_true", help="Use per-process st.cache_data only")
+    args = parser.parse_args()
+
+    cache_file = None
+    if not args.no_shared:
+        cache_file = args.cache or os.path.join(tempfile.mkdtemp(prefix="stockinfo-"), "cache.sqlite")
+
+    jobs = [(i, args.sessions, cache_file, i) for i in range(args.workers)]
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        results = pool.map(run_worker, jobs)
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(l for _, worker_latencies, _, _ in results for l in worker_latencies)
+    errors = sum(e for _, _, e, _ in results)
+    upstream = Counter()
+    for _, _, _, counts in results:
+        upstream.update(counts)
+
+    mode = "shared cache" if cache_file else "per-process cache"
+    print(f"Mode: {mode}" + (f" ({cache_file})" if cache_file else ""))
+    print(f"{len(latencies)} sessions from {args.workers} workers in {elapsed:.1f}s, {errors} with errors")
+    print(f"Session latency p50 {latencies[len(latencies) // 2]:.2f}s, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.2f}s, max {latencies[-1]:.2f}s")
+    print("Upstream calls, summed over workers:")
+    for name, count in sorted(upstream.items()):
+        print(f"  {name}: {count}")
+    if cache_file:
+        print("Shared cache misses (fetches recorded in the cache file):")
+        for name, count in shared_cache.fetch_counts(cache_file).items():
+            print(f"  {name}: {count}")
+        print(f"Cache file size: {os.path.getsize(cache_file) / 1e6:.1f} MB")
+
+
+# The guard keeps spawned pool workers from re-running the load test
+if __name__ == "__main__":
+    main()
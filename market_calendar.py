@@ -0,0 +1,168 @@
+import re
+from datetime import date, time, timedelta
+from functools import lru_cache
+
+import pandas as pd
+
+# Regular session hours and holiday rules for the exchanges the dashboard lists.
+# Early closes (e.g. the day after Thanksgiving) are treated as full sessions.
+EXCHANGES = {
+    'XNYS': {'tz': 'America/New_York', 'open': time(9, 30), 'close': time(16, 0)},
+    'XETRA': {'tz': 'Europe/Berlin', 'open': time(9, 0), 'close': time(17, 30)},
+}
+
+# Listing suffix -> exchange
+SUFFIX_EXCHANGE = {
+    '.DE': 'XETRA',
+    '.F': 'XETRA',
+}
+
+# Plain US share symbols such as NVDA or BRK-B. Crypto pairs (BTC-USD), FX (EURUSD=X),
+# indices (^GSPC) and other foreign listings (7203.T) don't match.
+US_TICKER = re.compile(r'^[A-Z]{1,5}(-[A-Z])?$')
+
+
+def exchange_for_ticker(ticker):
+    # None means the calendar is unknown and callers fall back to weekday-only filtering
+    ticker = ticker.upper()
+    for suffix, exchange in SUFFIX_EXCHANGE.items():
+        if ticker.endswith(suffix):
+            return exchange
+    if US_TICKER.match(ticker):
+        return 'XNYS'
+    return None
+
+
+def _easter(year):
+    # Anonymous Gregorian algorithm
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year, month, weekday, n):
+    # n-th given weekday (0=Mon) of a month; n=-1 means the last one
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year, 12, 31)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day):
+    # NYSE moves Saturday holidays to Friday and Sunday holidays to Monday
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _xnys_holidays(year):
+    easter = _easter(year)
+    days = [
+        _nth_weekday(year, 1, 0, 3),   # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),   # Washington's Birthday
+        easter - timedelta(days=2),    # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _observed(date(year, 7, 4)),   # Independence Day
+        _nth_weekday(year, 9, 0, 1),   # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)), # Christmas
+    ]
+    # New Year's Day on a Saturday is not moved back into the previous year
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.append(_observed(new_year))
+    if year >= 2022:
+        days.append(_observed(date(year, 6, 19)))  # Juneteenth
+    return days
+
+
+def _xetra_holidays(year):
+    easter = _easter(year)
+    return [
+        date(year, 1, 1),
+        easter - timedelta(days=2),  # Good Friday
+        easter + timedelta(days=1),  # Easter Monday
+        date(year, 5, 1),
+        date(year, 12, 24),
+        date(year, 12, 25),
+        date(year, 12, 26),
+        date(year, 12, 31),
+    ]
+
+
+HOLIDAY_RULES = {
+    'XNYS': _xnys_holidays,
+    'XETRA': _xetra_holidays,
+}
+
+
+@lru_cache(maxsize=None)
+def holidays(exchange, year):
+    # Weekday holidays only; weekends are handled separately
+    days = {d for d in HOLIDAY_RULES[exchange](year) if d.weekday() < 5}
+    return pd.DatetimeIndex(sorted(days))
+
+
+def _holidays_between(exchange, start, end):
+    years = range(start.year, end.year + 1)
+    days = pd.DatetimeIndex([]).append([holidays(exchange, y) for y in years])
+    return days[(days >= pd.Timestamp(start.date())) & (days <= pd.Timestamp(end.date()))]
+
+
+def is_intraday(index):
+    return len(index) > 1 and (index[1:] - index[:-1]).min() < pd.Timedelta(days=1)
+
+
+def filter_sessions(df, exchange):
+    """Keep only rows that fall inside a regular session of `exchange`.
+
+    Intraday rows are moved to exchange-local time so the chart shows session hours.
+    With `exchange` None only weekends are dropped.
+    """
+    if df.empty:
+        return df
+    if exchange is None:
+        return df[df.index.dayofweek < 5]
+    spec = EXCHANGES[exchange]
+    index = df.index
+    intraday = is_intraday(index)
+    if intraday and index.tz is not None:
+        index = index.tz_convert(spec['tz'])
+
+    days = index.tz_localize(None).normalize() if index.tz is not None else index.normalize()
+    mask = (days.dayofweek < 5) & ~days.isin(_holidays_between(exchange, days.min(), days.max()))
+    if intraday:
+        clock = index.time
+        mask &= (clock >= spec['open']) & (clock < spec['close'])
+
+    df = df[mask]
+    df.index = index[mask]
+    return df
+
+
+def rangebreaks(exchange, index):
+    """Plotly rangebreaks hiding weekends, holidays in range and, for intraday data, overnight hours."""
+    breaks = [dict(bounds=["sat", "mon"])]
+    if exchange is None or len(index) == 0:
+        return breaks
+    days = index.tz_localize(None) if index.tz is not None else index
+    closed = _holidays_between(exchange, days.min(), days.max())
+    if len(closed):
+        breaks.append(dict(values=closed.strftime('%Y-%m-%d').tolist()))
+    if is_intraday(index):
+        spec = EXCHANGES[exchange]
+        close = spec['close'].hour + spec['close'].minute / 60
+        open_ = spec['open'].hour + spec['open'].minute / 60
+        breaks.append(dict(bounds=[close, open_], pattern="hour"))
+    return breaks
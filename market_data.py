@@ -0,0 +1,45 @@
+import requests
+import yfinance as yf
+
+import market_calendar
+import portfolio
+
+# Plain fetch functions shared by the dashboard (which wraps them in st.cache_data)
+# and the headless workers, so nothing here may import streamlit.
+
+# Same fallback rates the dashboard's convert_* helpers use when the API is unreachable
+FALLBACK_RATES = {
+    'usd': {'eur': 0.92},
+    'eur': {'usd': 1.08},
+}
+
+
+def fetch_stock_data(ticker, period, interval="1d"):
+    stock = yf.Ticker(ticker)
+    # Get historical data, dropping anything outside the exchange's sessions once here
+    # so the cached frame is already clean for every rerun
+    df = stock.history(period=period, interval=interval)
+    df = market_calendar.filter_sessions(df, market_calendar.exchange_for_ticker(ticker))
+    # Get info for ratios
+    info = stock.info
+    return df, info
+
+
+def fetch_price_table(tickers, period, interval="1d"):
+    # Closing prices for many tickers in a single download, one column per ticker
+    df = yf.download(list(tickers), period=period, interval=interval, progress=False, auto_adjust=True)
+    return df['Close'].reindex(columns=list(tickers))
+
+
+def fetch_fx_table(base):
+    # One request returns every rate quoted against `base`
+    url = f"https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/{base.lower()}.json"
+    
+    try:
+        response = requests.get(url, timeout=10)
+        data = response.json()
+        rates = data[base.lower()]
+    except Exception as e:
+        print(f"Error: {e}")
+        rates = FALLBACK_RATES.get(base.lower(), {}) # Fallback
+    return portfolio.fx_to_base(rates, base)
@@ -0,0 +1,102 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Listing suffix -> trading currency. Other suffixes (e.g. 7203.T) are unknown and need a
+# currency column in the CSV; without one their lots are left unvalued.
+SUFFIX_CURRENCY = {
+    '.DE': 'EUR',
+    '.F': 'EUR',
+    '.PA': 'EUR',
+    '.AS': 'EUR',
+    '.MI': 'EUR',
+    '.MC': 'EUR',
+    '.SW': 'CHF',
+}
+
+# Plain US share symbols (NVDA, BRK-B) and crypto pairs quoted in a currency (BTC-USD)
+US_TICKER = re.compile(r'^[A-Z]{1,5}(-[A-Z])?$')
+QUOTED_PAIR = re.compile(r'^[A-Z0-9]+-([A-Z]{3})$')
+
+REQUIRED_COLUMNS = ['ticker', 'quantity', 'cost_basis']
+
+
+def infer_currency(ticker):
+    # None when the currency can't be told from the symbol
+    for suffix, currency in SUFFIX_CURRENCY.items():
+        if ticker.endswith(suffix):
+            return currency
+    if US_TICKER.match(ticker):
+        return 'USD'
+    pair = QUOTED_PAIR.match(ticker)
+    if pair:
+        return pair.group(1)
+    return None
+
+
+def load_positions_csv(file):
+    """Read lots from a CSV with ticker, quantity, cost_basis and an optional currency column.
+
+    One row per lot; the same ticker may appear several times. `cost_basis` is the price
+    paid per share, in the listing's currency.
+    """
+    lots = pd.read_csv(file)
+    lots.columns = [c.strip().lower() for c in lots.columns]
+    missing = [c for c in REQUIRED_COLUMNS if c not in lots.columns]
+    if missing:
+        raise ValueError(f"Portfolio CSV is missing column(s): {', '.join(missing)}")
+
+    lots['ticker'] = lots['ticker'].astype(str).str.strip().str.upper()
+    lots['quantity'] = pd.to_numeric(lots['quantity'], errors='raise').astype(float)
+    lots['cost_basis'] = pd.to_numeric(lots['cost_basis'], errors='raise').astype(float)
+
+    inferred = lots['ticker'].map(infer_currency)
+    if 'currency' in lots.columns:
+        given = lots['currency'].map(lambda c: str(c).strip().upper() if pd.notna(c) and str(c).strip() else None)
+        lots['currency'] = given.where(given.notna(), inferred)
+    else:
+        lots['currency'] = inferred
+    return lots[REQUIRED_COLUMNS + ['currency']].reset_index(drop=True)
+
+
+def fx_to_base(rates, base):
+    # `rates` is the currency API payload for `base`: units of X per 1 unit of base.
+    # Invert it so multiplying an amount in X gives the amount in base.
+    table = pd.Series({k.upper(): float(v) for k, v in rates.items() if v})
+    table[base.upper()] = 1.0
+    return 1.0 / table
+
+
+def value_portfolio(lots, closes, fx):
+    """Mark every lot to market in the base currency in one vectorized pass.
+
+    `closes` is a wide frame of closing prices (one column per ticker, native currency),
+    `fx` maps currency code -> base units per unit. Returns (per-lot frame, per-ticker frame).
+    """
+    # Carry prices over the other exchange's holidays; a ticker without a close on the
+    # first row starts its period at its first available close
+    closes = closes.ffill().bfill()
+    last = closes.iloc[-1]
+    prev = closes.iloc[-2] if len(closes) > 1 else last
+    first = closes.iloc[0]
+
+    tickers = lots['ticker']
+    qty = lots['quantity'].to_numpy()
+    rate = fx.reindex(lots['currency']).to_numpy()
+    price = last.reindex(tickers).to_numpy()
+
+    out = lots.copy()
+    out['price'] = price
+    out['market_value'] = qty * price * rate
+    out['cost'] = qty * lots['cost_basis'].to_numpy() * rate
+    out['unrealized_pnl'] = out['market_value'] - out['cost']
+    out['daily_pnl'] = qty * (price - prev.reindex(tickers).to_numpy()) * rate
+    out['period_pnl'] = qty * (price - first.reindex(tickers).to_numpy()) * rate
+
+    value_cols = ['quantity', 'market_value', 'cost', 'unrealized_pnl', 'daily_pnl', 'period_pnl']
+    holdings = out.groupby('ticker', sort=False)[value_cols].sum(min_count=1)
+    total = holdings['market_value'].sum()
+    holdings['allocation'] = holdings['market_value'] / total if total else np.nan
+    holdings = holdings.sort_values('market_value', ascending=False)
+    return out, holdings
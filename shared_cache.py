@@ -0,0 +1,133 @@
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process single-flight, the cache still works
+    fcntl = None
+
+# Cross-process cache for multi-process deployments. When several Streamlit servers run
+# behind a load balancer, point them all at the same file:
+#
+#     STOCKINFO_SHARED_CACHE=/var/cache/stockinfo/cache.sqlite streamlit run dashboard.py
+#
+# Entries live in one SQLite file in WAL mode, so readers never block each other or the
+# writer. A per-key file lock makes sure only one process fetches a missing entry while
+# the others wait and then read its result.
+
+ENV_VAR = "STOCKINFO_SHARED_CACHE"
+
+_local = threading.local()
+
+
+def cache_path():
+    return os.environ.get(ENV_VAR) or None
+
+
+def enabled():
+    return cache_path() is not None
+
+
+def _connect(path):
+    # sqlite3 connections must not be shared between threads; Streamlit runs each session in its own
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS fetches (name TEXT PRIMARY KEY, count INTEGER)")
+        conns[path] = conn
+    return conn
+
+
+def _get(conn, key):
+    row = conn.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+    if row is None or (row[1] is not None and row[1] < time.time()):
+        return None
+    return row
+
+
+def _put(conn, key, name, value, ttl):
+    expires = time.time() + ttl if ttl is not None else None
+    blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", (key, blob, expires))
+        conn.execute(
+            "INSERT INTO fetches VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET count = count + 1",
+            (name,)
+        )
+        # Expired rows are cleared by whichever process happens to write next
+        conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+class _KeyLock:
+    def __init__(self, path, key):
+        lock_dir = path + ".locks"
+        os.makedirs(lock_dir, exist_ok=True)
+        self.lock_file = os.path.join(lock_dir, key[:32] + ".lock")
+        self.fd = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self.fd = open(self.lock_file, "a")
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            self.fd.close()
+            self.fd = None
+
+
+def cached(ttl=None):
+    """Decorator caching a function's return value in the shared SQLite file for `ttl` seconds.
+
+    Arguments and return values must be picklable. Without STOCKINFO_SHARED_CACHE set,
+    the function is called directly.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            path = cache_path()
+            if path is None:
+                return func(*args, **kwargs)
+
+            key = hashlib.sha256(pickle.dumps((name, args, sorted(kwargs.items())))).hexdigest()
+            conn = _connect(path)
+            row = _get(conn, key)
+            if row is None:
+                with _KeyLock(path, key):
+                    # Another process may have filled the entry while we waited for the lock
+                    row = _get(conn, key)
+                    if row is None:
+                        value = func(*args, **kwargs)
+                        _put(conn, key, name, value, ttl)
+                        return value
+            return pickle.loads(row[0])
+
+        return wrapper
+    return decorator
+
+
+def fetch_counts(path=None):
+    """Number of upstream calls (cache misses) recorded per function."""
+    conn = _connect(path or cache_path())
+    return dict(conn.execute("SELECT name, count FROM fetches ORDER BY name").fetchall())
@@ -0,0 +1,61 @@
+import pandas as pd
+from datetime import time
+
+import market_calendar
+
+# Known exchange holidays (weekdays only), taken from the published NYSE and Xetra calendars
+expected = {
+    ('XNYS', 2021): ['01-01', '01-18', '02-15', '04-02', '05-31', '07-05', '09-06', '11-25', '12-24'],
+    # New Year's Day 2022 falls on a Saturday and is not observed; Juneteenth and Christmas move to Monday
+    ('XNYS', 2022): ['01-17', '02-21', '04-15', '05-30', '06-20', '07-04', '09-05', '11-24', '12-26'],
+    ('XNYS', 2024): ['01-01', '01-15', '02-19', '03-29', '05-27', '06-19', '07-04', '09-02', '11-28', '12-25'],
+    ('XNYS', 2025): ['01-01', '01-20', '02-17', '04-18', '05-26', '06-19', '07-04', '09-01', '11-27', '12-25'],
+    ('XETRA', 2024): ['01-01', '03-29', '04-01', '05-01', '12-24', '12-25', '12-26', '12-31'],
+    ('XETRA', 2025): ['01-01', '04-18', '04-21', '05-01', '12-24', '12-25', '12-26', '12-31'],
+    # Dec 26 2026 is a Saturday
+    ('XETRA', 2026): ['01-01', '04-03', '04-06', '05-01', '12-24', '12-25', '12-31'],
+}
+
+print("--- Holiday lists ---")
+for (exchange, year), days in expected.items():
+    actual = market_calendar.holidays(exchange, year).strftime('%m-%d').tolist()
+    print(f"{exchange} {year}: {actual}")
+    assert actual == days, f"{exchange} {year}: expected {days}, got {actual}"
+
+
+def check_intraday(exchange, start, end, sessions):
+    # 5 minute bars around the clock in UTC, as a stand-in for a raw download
+    index = pd.date_range(start, end, freq='5min', tz='UTC')
+    df = pd.DataFrame({'Close': range(len(index))}, index=index)
+    filtered = market_calendar.filter_sessions(df, exchange)
+
+    spec = market_calendar.EXCHANGES[exchange]
+    assert str(filtered.index.tz) == spec['tz'], f"index not in exchange-local time: {filtered.index.tz}"
+    days = sorted({str(d) for d in filtered.index.date})
+    print(f"{exchange}: {len(df)} bars -> {len(filtered)} bars on {days}")
+    assert days == sessions, f"{exchange}: expected sessions {sessions}, got {days}"
+
+    for day, bars in filtered.groupby(filtered.index.date):
+        assert bars.index[0].time() == spec['open'], f"{day}: first bar at {bars.index[0].time()}"
+        assert bars.index[-1].time() < spec['close'], f"{day}: bar after close at {bars.index[-1].time()}"
+        assert all(spec['open'] <= t < spec['close'] for t in bars.index.time)
+
+
+print("\n--- Intraday session filtering ---")
+# US clocks change on 2024-03-10, so the session moves from 14:30 to 13:30 UTC
+check_intraday('XNYS', '2024-03-08', '2024-03-13', ['2024-03-08', '2024-03-11', '2024-03-12'])
+# Good Friday and Easter Monday 2024
+check_intraday('XETRA', '2024-03-28', '2024-04-03', ['2024-03-28', '2024-04-02'])
+
+print("\n--- Unknown exchange ---")
+assert market_calendar.exchange_for_ticker('7203.T') is None
+assert market_calendar.exchange_for_ticker('BTC-USD') is None
+index = pd.date_range('2024-12-23', '2024-12-30', freq='h', tz='UTC')
+df = pd.DataFrame({'Close': 1.0}, index=index)
+filtered = market_calendar.filter_sessions(df, None)
+# Only weekends are dropped; Christmas and overnight hours stay
+assert (filtered.index.dayofweek < 5).all() and (filtered.index.date == pd.Timestamp('2024-12-25').date()).any()
+assert market_calendar.rangebreaks(None, filtered.index) == [dict(bounds=["sat", "mon"])]
+print(f"{len(df)} bars -> {len(filtered)} bars (weekends only)")
+
+print("\nVerification successful: holiday lists and session hours match the exchange calendars.")